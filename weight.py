@@ -1,16 +1,18 @@
-import serial
 import time
-import csv
 import os
+import math
 import logging
+import logging.handlers
+import re
+import select
 import signal
-from datetime import datetime, timedelta
-import firebase_admin
-from firebase_admin import credentials, db
+import random
+import statistics
+import json
+import collections
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
 import subprocess
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
 # ========== CONFIGURATION ==========
 SCALE_PORTS = [
@@ -19,78 +21,128 @@ SCALE_PORTS = [
 CSV_PATH = "/home/evogene2/Desktop/get_weight/weight.csv"
 FIREBASE_CRED = "/home/evogene2/Desktop/get_weight/Weight.json"
 FIREBASE_URL = "https://getweight-5edee-default-rtdb.firebaseio.com/"
+FIREBASE_PATH_304 = "weights/12644"
+FIREBASE_PATH_303 = "weights/303"
+FIREBASE_SCOPES = [
+    "https://www.googleapis.com/auth/firebase.database",
+    "https://www.googleapis.com/auth/userinfo.email",
+]
+FIREBASE_TIMEOUT = 30  # seconds
+TOKEN_REFRESH_MARGIN = 60  # seconds
 LOG_PATH = "/home/evogene2/Desktop/get_weight/weight_logger.log"
 MAX_RECONNECT_ATTEMPTS = 5
 RECONNECT_DELAY = 5  # seconds
-WEIGHT_VALIDATION_THRESHOLD = 0.5  # kg
-MAX_VALIDATION_RETRIES = 10
+MAX_REBIND_ATTEMPTS = 3  # consecutive failed slots before falling back to a reboot
+STALE_BUFFER_AGE = 1  # seconds
+FRAME_TIMEOUT = 0.3  # seconds
+SAMPLES_PER_READING = 5
+MIN_VALID_SAMPLES = 3
+EMA_ALPHA = 0.2
+EMA_INITIAL_VARIANCE = 0.25  # kg^2
+OUTLIER_SIGMAS = 3
+SLOT_INTERVAL = 600  # seconds
+CLOCK_JUMP_TOLERANCE = 60  # seconds
+MAX_PENDING_ROWS = 10_000
 
 # ========== LOGGING SETUP ==========
-logging.basicConfig(
-    filename=LOG_PATH,
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s"
-)
+# Buffer records in memory and write them out once per slot (or immediately on
+# errors) instead of a small write for every log line
+file_handler = logging.FileHandler(LOG_PATH)
+file_handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
+log_buffer = logging.handlers.MemoryHandler(capacity=200, flushLevel=logging.ERROR, target=file_handler)
+logging.getLogger().addHandler(log_buffer)
+logging.getLogger().setLevel(logging.INFO)
 
 # ========== FIREBASE SETUP ==========
-def setup_firebase_with_retry():
-    """Setup Firebase with retry mechanism for network issues"""
-    max_retries = 3
-    retry_delay = 10
-    
-    for attempt in range(max_retries):
-        try:
-            # Configure requests session with retry strategy
-            session = requests.Session()
-            retry_strategy = Retry(
-                total=3,
-                backoff_factor=1,
-                status_forcelist=[429, 500, 502, 503, 504],
-            )
-            adapter = HTTPAdapter(max_retries=retry_strategy)
-            session.mount("http://", adapter)
-            session.mount("https://", adapter)
-            
-            cred = credentials.Certificate(FIREBASE_CRED)
-            firebase_admin.initialize_app(cred, {'databaseURL': FIREBASE_URL})
-            ref_304 = db.reference('weights/12644')
-            ref_303 = db.reference('weights/12644')
-            
-            logging.info("Firebase initialized successfully")
-            return ref_304, ref_303
-            
-        except Exception as e:
-            logging.warning(f"Firebase setup attempt {attempt + 1} failed: {e}")
-            if attempt < max_retries - 1:
-                logging.info(f"Retrying Firebase setup in {retry_delay} seconds...")
-                time.sleep(retry_delay)
-                retry_delay *= 2  # Exponential backoff
-            else:
-                logging.error("Failed to initialize Firebase after all retries")
-                raise
-
-try:
-    ref_304, ref_303 = setup_firebase_with_retry()
-except Exception as e:
-    logging.error(f"Failed to initialize Firebase: {e}")
-    raise
+def setup_firebase():
+    """Setup a persistent Firebase REST session and load the service account key"""
+    # Imported here rather than at module level: requests/urllib3/google-auth
+    # are slow to import on a Pi and are only needed once Firebase is set up
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    from google.oauth2 import service_account
+
+    # Configure requests session with retry strategy; one pooled connection
+    # so the TLS session is reused across slots
+    session = requests.Session()
+    retry_strategy = Retry(
+        total=3,
+        backoff_factor=1,
+        status_forcelist=[429, 500, 502, 503, 504],
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=retry_strategy)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    # Only load the key here; the access token is fetched on the first upload so
+    # startup (and CSV logging) doesn't depend on the network being up
+    cred = service_account.Credentials.from_service_account_file(FIREBASE_CRED, scopes=FIREBASE_SCOPES)
+
+    logging.info("Firebase initialized successfully")
+    return session, cred
+
+def get_firebase_token(min_validity=TOKEN_REFRESH_MARGIN):
+    """Return the cached OAuth2 access token, refreshing it if it expires within min_validity seconds"""
+    import google.auth.transport.requests
+
+    expiry = firebase_cred.expiry  # naive UTC, as returned by google-auth
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    if expiry is None or expiry - now < timedelta(seconds=min_validity):
+        firebase_cred.refresh(google.auth.transport.requests.Request(firebase_session))
+    return firebase_cred.token
+
+def prewarm_firebase_token():
+    """Refresh the token now if it would expire before the next slot's upload"""
+    try:
+        get_firebase_token(SLOT_INTERVAL + TOKEN_REFRESH_MARGIN)
+    except Exception as e:
+        logging.warning(f"Firebase token pre-refresh failed, will retry on next upload: {e}")
+
+firebase_session = None
+firebase_cred = None
+
 # ========== SERIAL SCALE HANDLER ==========
+# Scale frames look like b"ST,GS,+  12.345kg"; sign and number may be space separated
+WEIGHT_RE = re.compile(rb'([-+]?)\s*(\d+\.?\d*)\s*kg', re.IGNORECASE)
+
 class Scale:
     def __init__(self, port):
         self.port = port
         self.serial = None
+        self.fd = None
+        self.usb_path = None
         self.failed = False
+        self.failed_slots = 0
         self.last_valid_weight = None
+        self.ema = None
+        self.ema_var = EMA_INITIAL_VARIANCE
+        self.last_read = 0
+        self.rx_buffer = bytearray()  # Partial frame carried over to the next read
+        self.resync = True  # Next line may have started mid-frame; drop it
         self.connect()
 
     def connect(self):
+        # Deferred to first connect to keep startup light; outside the retry loop
+        # so a missing pyserial fails loudly instead of looking like a bad port
+        import serial
+
         for attempt in range(1, MAX_RECONNECT_ATTEMPTS + 1):
             if not os.path.exists(self.port):
                 logging.warning(f"Device {self.port} does not exist. Skipping connection attempt.")
                 time.sleep(RECONNECT_DELAY)
                 continue
             try:
-                self.serial = serial.Serial(self.port, 9600, timeout=1)
+                self.serial = serial.Serial(self.port, 9600, timeout=FRAME_TIMEOUT)
+                self.fd = self.serial.fileno()
+                try:
+                    # Deliver bytes as they arrive instead of after the driver's latency timer
+                    self.serial.set_low_latency_mode(True)
+                except (AttributeError, ValueError) as e:
+                    logging.warning(f"Could not enable low latency mode on {self.port}: {e}")
+                self.usb_path = self.find_usb_device() or self.usb_path
+                self.rx_buffer.clear()
+                self.resync = True
                 logging.info(f"Connected to scale at {self.port}")
                 self.failed = False
                 return
@@ -101,6 +153,35 @@ class Scale:
         self.serial = None
         self.failed = True
 
+    def read_frames(self):
+        """Return buffered complete frames, waiting for at least one; a partial tail is kept for the next call"""
+        data = self.rx_buffer
+        deadline = time.monotonic() + FRAME_TIMEOUT
+        while True:
+            if self.resync:
+                # Discard up to the first newline: that line may have been cut by a flush or reconnect
+                newline = data.find(b'\n')
+                if newline >= 0:
+                    del data[:newline + 1]
+                    self.resync = False
+            # Block only until the first complete frame; after that just poll for leftovers
+            wait = 0 if not self.resync and b'\n' in data else deadline - time.monotonic()
+            if wait < 0:
+                break
+            ready, _, _ = select.select([self.fd], [], [], wait)
+            if not ready:
+                break
+            chunk = os.read(self.fd, 256)
+            if not chunk:
+                raise OSError(f"{self.port} is readable but returned no data (disconnected?)")
+            data += chunk
+        if self.resync:
+            return b""
+        end = data.rfind(b'\n') + 1
+        frames = bytes(data[:end])
+        del data[:end]
+        return frames
+
     def read_weight(self, max_attempts=5, delay=0.2):
         for attempt in range(max_attempts):
             try:
@@ -109,12 +190,25 @@ class Scale:
                     self.connect()
                     if self.serial is None:
                         continue
-                self.serial.reset_input_buffer()
-                line = self.serial.readline().decode('utf-8', errors='ignore').strip()
-                logging.debug(f"Raw from {self.port}: {line}")
-                if "kg" in line:
-                    weight_str = line.split(",")[-1].replace("kg", "").replace("+", "").strip()
-                    return float(weight_str)
+                if time.monotonic() - self.last_read > STALE_BUFFER_AGE:
+                    # Anything buffered since the previous slot is stale
+                    self.serial.reset_input_buffer()
+                    self.rx_buffer.clear()
+                    self.resync = True
+                # Take the newest complete frame from what is already buffered
+                # instead of flushing the input and waiting for a fresh one
+                data = self.read_frames()
+                self.last_read = time.monotonic()
+                # Newest complete frame first; the cheap b'kg' check skips partial/noise lines
+                for line in reversed(data.split(b'\n')):
+                    if b'kg' in line:
+                        break
+                else:
+                    line = b""
+                logging.debug("Raw from %s: %r", self.port, line)  # Only formatted when DEBUG is on
+                match = WEIGHT_RE.search(line)
+                if match:
+                    return float(match.group(1) + match.group(2))
             except Exception as e:
                 logging.warning(f"Error reading from {self.port} (attempt {attempt+1}): {e}")
                 self.connect()
@@ -122,74 +216,195 @@ class Scale:
         logging.error(f"Failed to get valid weight from {self.port} after retries")
         return None
 
+    def accept_sample(self, weight):
+        """Update the moving average with a sample and return whether it is not an outlier"""
+        if self.ema is None:
+            self.ema = weight
+            return True
+        # The variance tracks real drift, so the accept window widens and narrows with it
+        diff = weight - self.ema
+        self.ema_var = 0.9 * self.ema_var + 0.1 * diff * diff
+        self.ema += EMA_ALPHA * diff
+        return abs(diff) <= OUTLIER_SIGMAS * math.sqrt(self.ema_var)
+
     def get_validated_weight(self):
-        """Get a validated weight reading with consistency checks"""
-        if self.last_valid_weight is None:
-            # First reading, just get any valid reading
-            weight = self.read_weight()
-            if weight is not None:
-                self.last_valid_weight = weight
-                logging.info(f"Initial weight reading for {self.port}: {weight}kg")
-            return weight
-        
-        # Try to get a consistent reading
-        for attempt in range(MAX_VALIDATION_RETRIES):
+        """Get a validated weight reading as the median of several samples"""
+        samples = []
+        for _ in range(SAMPLES_PER_READING):
             weight = self.read_weight()
             if weight is None:
-                logging.warning(f"Scale {self.port} returned no reading (attempt {attempt + 1})")
                 continue
-            
-            # Check if weight is within acceptable range
-            weight_diff = abs(weight - self.last_valid_weight)
-            if weight_diff <= WEIGHT_VALIDATION_THRESHOLD:
-                self.last_valid_weight = weight
-                logging.info(f"Valid weight reading for {self.port}: {weight}kg (diff: {weight_diff:.3f}kg)")
-                return weight
+            if self.accept_sample(weight):
+                samples.append(weight)
             else:
-                logging.warning(f"Weight reading for {self.port} too different: {weight}kg (diff: {weight_diff:.3f}kg, threshold: {WEIGHT_VALIDATION_THRESHOLD}kg)")
-        
-        # If we couldn't get a valid reading, use the last valid weight
-        logging.warning(f"Using last valid weight for {self.port}: {self.last_valid_weight}kg after {MAX_VALIDATION_RETRIES} failed attempts")
+                logging.warning(f"Outlier reading for {self.port}: {weight}kg (EMA: {self.ema:.3f}kg)")
+
+        if len(samples) >= MIN_VALID_SAMPLES:
+            weight = statistics.median(samples)
+            self.last_valid_weight = weight
+            logging.info(f"Valid weight reading for {self.port}: {weight}kg (median of {len(samples)} samples)")
+            return weight
+
+        # If we couldn't get enough samples, use the last valid weight
+        logging.warning(f"Using last valid weight for {self.port}: {self.last_valid_weight}kg, only {len(samples)}/{SAMPLES_PER_READING} samples accepted")
         return self.last_valid_weight
 
+    def find_usb_device(self):
+        """Return the sysfs directory of the USB device behind this port, or None"""
+        tty = os.path.basename(os.path.realpath(self.port))
+        path = os.path.realpath(f"/sys/class/tty/{tty}/device")
+        while path.startswith("/sys/devices/"):
+            # Interface directories ("1-1:1.0") also have 'authorized'; we want the device ("1-1")
+            if ":" not in os.path.basename(path) and os.path.isfile(os.path.join(path, "authorized")):
+                return path
+            path = os.path.dirname(path)
+        return None
+
+    def rebind(self):
+        """Reset the scale's USB device by toggling its 'authorized' flag, then reconnect"""
+        if self.usb_path is None:
+            logging.error(f"No USB device known for {self.port}, cannot rebind")
+            return
+        logging.warning(f"Rebinding USB device {self.usb_path} for {self.port}")
+        self.close()
+        authorized = os.path.join(self.usb_path, "authorized")
+        try:
+            for value in (b"0", b"1"):
+                subprocess.run(['sudo', 'tee', authorized], input=value, stdout=subprocess.DEVNULL, check=True)
+        except (OSError, subprocess.CalledProcessError) as e:
+            logging.error(f"Failed to rebind USB device {self.usb_path}: {e}")
+        time.sleep(1)  # Give the device time to re-enumerate
+        self.connect()
+
     def close(self):
         if self.serial and self.serial.is_open:
             self.serial.close()
             logging.info(f"Closed serial port {self.port}")
 # ========== CSV HANDLER ==========
+# Rows that could not be written yet (e.g. filesystem read-only); written first on the next success
+pending_rows = collections.deque(maxlen=MAX_PENDING_ROWS)
+
+def open_csv(num_weights):
+    """Open the CSV log once as an O_APPEND descriptor and write the header if the file is empty"""
+    fd = os.open(CSV_PATH, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    written = 0
+    try:
+        if os.fstat(fd).st_size == 0:
+            header = b",".join([b"timestamp"] + [b"weight%d" % (i + 1) for i in range(num_weights)]) + b"\r\n"
+            while written < len(header):
+                written += os.write(fd, header[written:])
+    except Exception:
+        # Cut off a torn header so the file is empty again and the header gets rewritten
+        if written:
+            try:
+                os.ftruncate(fd, 0)
+            except OSError:
+                pass
+        os.close(fd)
+        raise
+    return fd
+
+def format_csv_row(timestamp, weights):
+    """Pre-format a row as bytes; missing weights are written as empty fields like csv.writer does"""
+    fields = b",".join(b"" if w is None else b"%.3f" % w for w in weights)
+    return b"%s,%s\r\n" % (timestamp.isoformat().encode(), fields)
+
 def save_to_csv(timestamp, weights):
-    file_exists = os.path.isfile(CSV_PATH)
+    global csv_fd
+    pending_rows.append(format_csv_row(timestamp, weights))
+    written = 0
     try:
-        with open(CSV_PATH, mode="a", newline="") as file:
-            writer = csv.writer(file)
-            if not file_exists:
-                writer.writerow(["timestamp"] + [f"weight{i+1}" for i in range(len(weights))])
-            writer.writerow([timestamp.isoformat()] + weights)
+        if csv_fd is None:
+            csv_fd = open_csv(len(weights))
+        data = memoryview(b"".join(pending_rows))  # Backfill anything earlier writes missed
+        while written < len(data):  # One write() per slot unless the kernel takes a short write
+            written += os.write(csv_fd, data[written:])
+        pending_rows.clear()
         logging.info(f"CSV saved: {timestamp.isoformat()}, {weights}")
     except Exception as e:
-        logging.error(f"Error writing to CSV: {e}")
+        # Keep only rows that aren't fully on disk, and cut off a torn partial row
+        while pending_rows and written >= len(pending_rows[0]):
+            written -= len(pending_rows.popleft())
+        if written and csv_fd is not None:
+            try:
+                os.ftruncate(csv_fd, os.fstat(csv_fd).st_size - written)
+            except OSError:
+                pass
+        logging.error(f"Error writing to CSV ({len(pending_rows)} rows pending): {e}")
+        # Drop the descriptor so the next slot reopens the file
+        if csv_fd is not None:
+            try:
+                os.close(csv_fd)
+            except OSError:
+                pass
+            csv_fd = None
 
 # ========== FIREBASE UPLOAD ==========
+PUSH_CHARS = "-0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz"
+_last_push_time = 0
+_last_rand_chars = []
+
+def generate_push_id():
+    """Generate a chronologically ordered Firebase push ID locally (no network call)"""
+    global _last_push_time, _last_rand_chars
+    now = int(time.time() * 1000)
+    duplicate_time = now == _last_push_time
+    _last_push_time = now
+
+    time_chars = []
+    for _ in range(8):
+        time_chars.append(PUSH_CHARS[now % 64])
+        now //= 64
+    push_id = "".join(reversed(time_chars))
+
+    if not duplicate_time:
+        _last_rand_chars = [random.randrange(64) for _ in range(12)]
+    else:
+        # Same millisecond: increment the random part so IDs stay unique and ordered
+        i = 11
+        while i >= 0 and _last_rand_chars[i] == 63:
+            _last_rand_chars[i] = 0
+            i -= 1
+        _last_rand_chars[i] += 1
+    return push_id + "".join(PUSH_CHARS[c] for c in _last_rand_chars)
+
 def upload_to_firebase(timestamp, weights):
     max_retries = 3
     retry_delay = 5
-    
+
+    # Scales 1 and 2 to weights/304
+    data_304 = {'timestamp': timestamp.isoformat()}
+    for i, w in enumerate(weights[:3], 1):  # Only first two
+        data_304[f'weight{i}'] = w
+    updates = {f'{FIREBASE_PATH_304}/{generate_push_id()}': data_304}
+
+    # Scale 3 to weights/303
+    data_303 = None
+    if len(weights) > 3:
+        data_303 = {
+            'timestamp': timestamp.isoformat(),
+            'weight1': weights[2]
+        }
+        updates[f'{FIREBASE_PATH_303}/{generate_push_id()}'] = data_303
+
+    # Serialize once; retries resend the same bytes
+    payload = json.dumps(updates, separators=(',', ':')).encode()
+
     for attempt in range(max_retries):
         try:
-            # Scales 1 and 2 to weights/304
-            data_304 = {'timestamp': timestamp.isoformat()}
-            for i, w in enumerate(weights[:3], 1):  # Only first two
-                data_304[f'weight{i}'] = w
-            ref_304.push(data_304)
+            # Single multi-path update: both locations are written atomically in one request
+            response = firebase_session.patch(
+                f"{FIREBASE_URL}.json",
+                data=payload,
+                headers={
+                    "Authorization": f"Bearer {get_firebase_token()}",
+                    "Content-Type": "application/json",
+                },
+                timeout=FIREBASE_TIMEOUT,
+            )
+            response.raise_for_status()
             logging.info(f"Firebase uploaded to weights/304: {data_304}")
-
-            # Scale 3 to weights/303
-            if len(weights) > 3:
-                data_303 = {
-                    'timestamp': timestamp.isoformat(),
-                    'weight1': weights[2]
-                }
-                ref_303.push(data_303)
+            if data_303 is not None:
                 logging.info(f"Firebase uploaded to weights/303: {data_303}")
             
             return  # Success, exit retry loop
@@ -205,18 +420,29 @@ def upload_to_firebase(timestamp, weights):
 
 # ========== TIME SLOT HANDLER ==========
 def get_next_slot():
-    now = datetime.now()
-    next_slot = (now + timedelta(minutes=10)).replace(second=0, microsecond=0)
-    return next_slot - timedelta(minutes=now.minute % 10)
+    """Return the epoch second of the next 10-minute boundary in local time"""
+    ts = int(time.time())
+    local_ts = ts + time.localtime(ts).tm_gmtoff  # Keep slots aligned to local wall-clock minutes
+    return ts + (SLOT_INTERVAL - local_ts % SLOT_INTERVAL)
 
 # ========== GRACEFUL SHUTDOWN ==========
 scales = []
+csv_fd = None
+read_pool = None
+upload_pool = None
 
 def cleanup_and_exit(signum, frame):
     logging.info("Received shutdown signal. Closing serial ports and exiting.")
+    if read_pool is not None:
+        read_pool.shutdown(wait=False)
+    if upload_pool is not None:
+        upload_pool.shutdown(wait=False)  # Queued uploads still finish before exit
     for scale in scales:
         scale.close()
+    if csv_fd is not None:
+        os.close(csv_fd)
     logging.info("Shutdown complete.")
+    log_buffer.flush()
     exit(0)
 
 signal.signal(signal.SIGTERM, cleanup_and_exit)
@@ -224,37 +450,78 @@ signal.signal(signal.SIGINT, cleanup_and_exit)
 
 # ========== MAIN LOOP ==========
 def main():
-    global scales
+    global scales, read_pool, upload_pool, firebase_session, firebase_cred
     scales = [Scale(port) for port in SCALE_PORTS]
+    read_pool = ThreadPoolExecutor(max_workers=len(scales))
+    upload_pool = ThreadPoolExecutor(max_workers=1)  # Single worker keeps uploads in order
     last_weights = [None] * len(scales)  # Initialize with None
 
+    try:
+        firebase_session, firebase_cred = setup_firebase()
+    except Exception as e:
+        logging.error(f"Failed to initialize Firebase: {e}")
+        raise
+
     logging.info("Starting synchronized reading loop (every 10 minutes)...")
+    # Align slots to the wall clock once, then sleep against the monotonic clock
+    # so NTP corrections can't shift or shorten the wait
+    slot_ts = get_next_slot()
+    next_deadline = time.monotonic() + (slot_ts - time.time())
     while True:
-        now = datetime.now()
-        next_time = get_next_slot()
-        wait_seconds = (next_time - now).total_seconds()
+        wait_seconds = next_deadline - time.monotonic()
         logging.info(f"Sleeping for {int(wait_seconds)} seconds until next reading...")
+        log_buffer.flush()
         time.sleep(max(0, wait_seconds))
 
-        t = datetime.now().replace(second=0, microsecond=0)
+        # Realign if the wall clock was stepped (e.g. first NTP sync after boot)
+        clock_skew = (time.time() - slot_ts) - (time.monotonic() - next_deadline)
+        if abs(clock_skew) > CLOCK_JUMP_TOLERANCE:
+            logging.warning(f"System clock moved {clock_skew:.0f}s relative to the schedule. Realigning slots.")
+            slot_ts = get_next_slot() - SLOT_INTERVAL  # Slot boundary we are currently in
+            next_deadline = time.monotonic() - (time.time() - slot_ts)
+
+        t = datetime.fromtimestamp(slot_ts)
         weights = []
-        for i, scale in enumerate(scales):
-            w = scale.get_validated_weight()  # Use validated weight reading
+        # Read all scales concurrently; each read blocks in select() on its port, which releases the GIL
+        readings = read_pool.map(lambda scale: scale.get_validated_weight(), scales)
+        for i, (scale, w) in enumerate(zip(scales, readings)):
             if w is not None:
                 last_weights[i] = w  # Update last successful value
                 weights.append(w)
             else:
                 logging.error(f"Scale {i+1} ({scale.port}) returned no reading. Using last value: {last_weights[i]}")
                 weights.append(last_weights[i])  # Use last value
-                scale.failed = True  # Mark as failed to trigger reboot
+                scale.failed = True  # Mark as failed to trigger a USB rebind
 
         save_to_csv(t, weights)
-        upload_to_firebase(t, weights)
+        # Upload in the background so retries/backoff don't delay the next slot
+        upload = upload_pool.submit(upload_to_firebase, t, weights)
+        # Refresh the token off the critical path so the next upload never waits on it
+        upload_pool.submit(prewarm_firebase_token)
 
-        # Reboot if any scale failed to connect
-        if any(scale.failed for scale in scales):
-            logging.error("At least one scale failed to connect after retries. Rebooting system.")
+        # Rebind failed scales' USB devices; reboot only if that keeps failing
+        for scale in scales:
+            scale.failed_slots = scale.failed_slots + 1 if scale.failed else 0
+        if any(scale.failed_slots > MAX_REBIND_ATTEMPTS for scale in scales):
+            logging.error(f"At least one scale still failing after {MAX_REBIND_ATTEMPTS} USB rebinds. Rebooting system.")
+            upload.result()  # Don't lose this slot's upload to the reboot
             subprocess.run(['sudo', 'reboot'])
+        for scale in scales:
+            if scale.failed:
+                scale.rebind()
+
+        slot_ts += SLOT_INTERVAL
+        next_deadline += SLOT_INTERVAL
+        overrun = time.monotonic() - next_deadline
+        if overrun > 0:
+            # A slot whose whole interval has already passed is skipped; the current one runs late
+            missed = int(overrun // SLOT_INTERVAL)
+            if missed:
+                logging.warning(f"Slot work overran by {overrun:.0f}s, skipping {missed} slot(s)")
+            else:
+                logging.warning(f"Slot work overran by {overrun:.0f}s, running next slot late")
+            slot_ts += missed * SLOT_INTERVAL
+            next_deadline += missed * SLOT_INTERVAL
 
 if __name__ == "__main__":
     main()